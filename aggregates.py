@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Precomputed aggregates behind the analysis pages.
+
+The grouping itself is done by the query layer (queries.py). The functions
+here reshape those small result tables into the forms the pages slice, and
+are cached once per dataset version through data_loader.cached(), so widget
+interaction never groups the full stops frame.
+"""
+
+import numpy as np
+import pandas as pd
+
+CUBE_DIMS = ['year', 'driver_age_group', 'driver_race', 'driver_gender']
+
+POPULATION = {'driver_age_group': 'age_population',
+              'driver_race': 'race_population',
+              'driver_gender': 'gender_population'}
+
+# Most points a time series chart sends to the browser.
+POINT_BUDGET = 500
+
+# Resample rules of the time series bins, labelled by the first day of each bin.
+BINS = {'week': 'W-MON', 'month': 'MS'}
+BIN_DAYS = (('day', 1), ('week', 7), ('month', 30.44))
+
+# Rates are searches or arrests per census population, in percent. The
+# duration page has always plotted the mean stop hour, kept as is here.
+MEASURES = ('searches', 'arrests', 'duration')
+
+
+def rate_table(cube, hue, measure):
+    """Roll the cube up to (year, hue) and return one measure indexed by year.
+
+    cube holds the 'cube' query: stops, searches, arrests and stop hour sums
+    per year, age group, race and gender, with the population columns.
+    """
+    grouped = cube.groupby(['year', hue], observed=True)
+    if measure == 'duration':
+        values = grouped['stop_time_sum'].sum() / grouped['stops'].sum()
+        values.name = 'stop_time'
+    else:
+        values = 100 * grouped[measure].sum() / grouped[POPULATION[hue]].max()
+    table = values.reset_index()
+    table[hue] = table[hue].astype(object)
+    return table.set_index('year')
+
+
+def year_slice(table, years):
+    """Return the rows of a year-indexed table within the inclusive range."""
+    return table.loc[years[0]:years[1]]
+
+
+def drug_counts(counts):
+    """Roll the drug_stops query up to counts by hour, age group and race.
+
+    The age group and race tables carry normalized_count, the drug stops per
+    census population of the group.
+    """
+    tables = {'stop_time': counts.groupby('stop_time')['count'].sum().reset_index()}
+    for column in ('driver_age_group', 'driver_race'):
+        table = counts.groupby(column, observed=True).agg(
+            count=('count', 'sum'), population=(POPULATION[column], 'max'))
+        table['normalized_count'] = table['count'] / table['population']
+        table = table.reset_index()
+        table[column] = table[column].astype(object)
+        tables[column] = table.sort_values(column, ignore_index=True)
+    return tables
+
+
+def speeding_by_age(counts, column):
+    """Speeding stops per census population by driver age, one column per group.
+
+    counts is the speeding query for column. Ages run down the index (0 to
+    100) and every value of column is a column, with NaN where that group has
+    no stops at that age.
+    """
+    population = counts.groupby(column, observed=True)['population'].max()
+    wide = counts.set_index(['driver_age', column])['speeding'].unstack(column)
+    wide = wide / population
+    wide = wide.loc[(wide.index >= 0) & (wide.index <= 100)]
+    wide.columns = wide.columns.astype(object)
+    wide.index = wide.index.astype(int).rename('age')
+    return wide
+
+
+def speeding_pair(wide, x, y):
+    """Return the age curves of groups x and y side by side for the scatter."""
+    pair = pd.DataFrame({'age': wide.index,
+                         '0_x': wide[x].to_numpy(),
+                         '0_y': wide[y].to_numpy()})
+    return pair.dropna(subset=['0_x', '0_y'], how='all')
+
+
+def daily_counts(counts, column):
+    """Map each value of column to its sorted stop dates and the stops on each.
+
+    counts is the daily query for column, one row per value and stop date.
+    """
+    counts = counts.sort_values([column, 'stop_date'])
+    daily = {}
+    for value, rows in counts.groupby(column, observed=True, sort=False):
+        dates = rows['stop_date'].to_numpy().astype('datetime64[D]')
+        daily[value] = (dates, rows['stops'].to_numpy())
+    return daily
+
+
+def date_range(daily, value, start, end, name=None):
+    """Return the daily counts of value between start and end, both inclusive."""
+    dates, counts = daily[value]
+    lo = np.searchsorted(dates, np.datetime64(start, 'D'), side='left')
+    hi = np.searchsorted(dates, np.datetime64(end, 'D'), side='right')
+    return pd.Series(counts[lo:hi], index=pd.Index(dates[lo:hi], name='stop_date'),
+                     name=name)
+
+
+def resolution(start, end, budget=POINT_BUDGET):
+    """Return the finest bin (day, week or month) that keeps start..end within budget points."""
+    days = (end - start).days + 1
+    for name, width in BIN_DAYS:
+        if days / width <= budget:
+            return name
+    return BIN_DAYS[-1][0]
+
+
+def bin_series(series, grain):
+    """Sum a daily count series into weekly or monthly bins; days are left as is."""
+    if grain == 'day':
+        return series
+    return series.resample(BINS[grain], label='left', closed='left').sum()
+
+
+def lttb(x, y, n):
+    """Return the indices of n points of (x, y) picked by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept, and the bucket holding the
+    minimum or maximum of y keeps that point, so peaks and troughs survive.
+    When both fall in one bucket it keeps both, returning n + 1 indices.
+    """
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    forced = sorted({int(np.argmin(y)), int(np.argmax(y))})
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    keep = [0]
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i == n - 3:
+            cx, cy = x[-1], y[-1]
+        else:
+            cx, cy = x[hi:edges[i + 2]].mean(), y[hi:edges[i + 2]].mean()
+        pinned = [f for f in forced if lo <= f < hi]
+        if pinned:
+            keep += pinned
+            a = pinned[-1]
+        else:
+            area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+            a = lo + int(np.argmax(area))
+            keep.append(a)
+    keep.append(size - 1)
+    return np.array(keep)
+
+
+def downsample(series, budget=POINT_BUDGET):
+    """Return series thinned to at most budget points with lttb()."""
+    if len(series) <= budget:
+        return series
+    # One point is held back for the case where lttb() keeps both extremes
+    # of a bucket.
+    return series.iloc[lttb(series.index.asi8, series.to_numpy(), budget - 1)]
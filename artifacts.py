@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Precomputed query results stored next to the dataset.
+
+Each dataset version gets its own directory holding one Arrow file per query
+and a manifest. A CURRENT file names the published version and is replaced
+atomically, so readers see either the old or the new set of results, never a
+mix. Results are only served when their dataset version and POLICE_STATES
+selection match the app's.
+
+    .snapshots/police_project.aggregates/CURRENT
+    .snapshots/police_project.aggregates/<sha1>/manifest.json
+    .snapshots/police_project.aggregates/<sha1>/<query>.arrow
+"""
+
+import json
+import os
+import shutil
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+import data_loader
+
+POINTER = 'CURRENT'
+MANIFEST = 'manifest.json'
+
+
+def root(path=data_loader.DATA_PATH):
+    """Return the directory holding the artifacts of path."""
+    return os.path.splitext(data_loader.snapshot_path(path))[0] + '.aggregates'
+
+
+def current(path=data_loader.DATA_PATH):
+    """Return the published version directory of path, or None."""
+    try:
+        with open(os.path.join(root(path), POINTER)) as f:
+            version = f.read().strip()
+    except OSError:
+        return None
+    return os.path.join(root(path), version) if version else None
+
+
+def _states(path):
+    # POLICE_STATES only limits what is read from a store.
+    if os.path.isdir(path) and data_loader.STATES:
+        return sorted(data_loader.STATES)
+    return None
+
+
+def manifest(path=data_loader.DATA_PATH):
+    """Return the manifest of the published artifacts if they match the dataset.
+
+    They match when they were computed from the current version of the
+    dataset with the same POLICE_STATES selection.
+    """
+    directory = current(path)
+    if directory is None or os.path.basename(directory) != data_loader.dataset_version(path):
+        return None
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if info.get('states') != _states(path):
+        return None
+    return info
+
+
+def read(name, path=data_loader.DATA_PATH):
+    """Return the stored result of query name, or None if it is missing or stale."""
+    info = manifest(path)
+    if info is None or name not in info['queries']:
+        return None
+    try:
+        return feather.read_table(os.path.join(current(path), name + '.arrow')).to_pandas()
+    except (OSError, pa.ArrowInvalid):
+        # A newer refresh may have published and pruned this version.
+        return None
+
+
+def publish(results, version, path=data_loader.DATA_PATH, extra=None):
+    """Write results ({query: frame}) as version and make it the current one."""
+    base = root(path)
+    tmp = os.path.join(base, '%s.tmp-%d' % (version, os.getpid()))
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for name, frame in results.items():
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        feather.write_feather(table, os.path.join(tmp, name + '.arrow'))
+    info = {'version': version, 'states': _states(path), 'queries': sorted(results),
+            'rows': {name: len(frame) for name, frame in results.items()}}
+    info.update(extra or {})
+    with open(os.path.join(tmp, MANIFEST), 'w') as f:
+        json.dump(info, f, indent=2)
+
+    target = os.path.join(base, version)
+    if os.path.exists(target):
+        old = '%s.old-%d' % (target, os.getpid())
+        os.rename(target, old)
+        os.rename(tmp, target)
+        shutil.rmtree(old)
+    else:
+        os.rename(tmp, target)
+    pointer = os.path.join(base, '%s.%d.tmp' % (POINTER, os.getpid()))
+    with open(pointer, 'w') as f:
+        f.write(version)
+    os.replace(pointer, os.path.join(base, POINTER))
+
+    for entry in os.listdir(base):
+        if entry not in (version, POINTER) and '.tmp' not in entry:
+            shutil.rmtree(os.path.join(base, entry), ignore_errors=True)
+    return target
+
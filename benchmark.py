@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for loading, enrichment and every page's aggregation.
+
+Synthetic stops with the police_project.csv layout are generated at each
+requested size, written to CSV and pushed through the same code the app runs.
+Each stage is timed, and its peak Python-tracked allocation is measured with
+tracemalloc (numpy and pandas buffers included). Results are written as JSON;
+pass --baseline with an earlier result file to print per-stage ratios.
+
+    python benchmark.py --sizes 100000 1000000 10000000 --output bench.json
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import aggregates
+import data_loader
+import export
+import queries
+
+SIZES = [100000, 1000000, 10000000]
+
+VIOLATIONS = (['Speeding', 'Moving violation', 'Equipment', 'Other',
+               'Registration/plates', 'Seat belt'],
+              [0.56, 0.187, 0.127, 0.049, 0.039, 0.038])
+OUTCOMES = (['Citation', 'Warning', 'Arrest Driver', 'No Action', 'N/D',
+             'Arrest Passenger'],
+            [0.89, 0.06, 0.029, 0.008, 0.007, 0.006])
+RACES = (['White', 'Black', 'Hispanic', 'Asian', 'Other'],
+         [0.715, 0.14, 0.11, 0.03, 0.005])
+SEARCH_TYPES = ['Incident to Arrest', 'Probable Cause', 'Inventory',
+                'Reasonable Suspicion', 'Protective Frisk',
+                'Incident to Arrest,Inventory',
+                'Incident to Arrest,Protective Frisk']
+DURATIONS = (['0-15 Min', '16-30 Min', '30+ Min'], [0.8, 0.15, 0.05])
+
+
+def synthetic_stops(n, seed=0):
+    """Return n raw stops shaped like police_project.csv."""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range('2005-01-02', '2015-12-31').strftime('%Y-%m-%d').to_numpy()
+    clock = np.array(['%02d:%02d' % (h, m) for h in range(24) for m in range(60)])
+    age = rng.integers(15, 100, n).astype(float)
+    age[rng.random(n) < 0.06] = np.nan
+    gender = rng.choice(['M', 'F'], n, p=[0.68, 0.32]).astype(object)
+    gender[rng.random(n) < 0.06] = np.nan
+    searched = rng.random(n) < 0.035
+    search_type = np.where(searched, rng.choice(SEARCH_TYPES, n), None)
+    arrested = (rng.random(n) < 0.035).astype(object)
+    arrested[rng.random(n) < 0.06] = np.nan
+
+    def pick(choices):
+        return rng.choice(choices[0], n, p=choices[1])
+
+    return pd.DataFrame({
+        'stop_date': days[rng.integers(0, len(days), n)],
+        'stop_time': clock[rng.integers(0, len(clock), n)],
+        'county_name': np.nan,
+        'driver_gender': gender,
+        'driver_age_raw': age,
+        'driver_age': age,
+        'driver_race': pick(RACES),
+        'violation_raw': pick(VIOLATIONS),
+        'violation': pick(VIOLATIONS),
+        'search_conducted': searched,
+        'search_type': search_type,
+        'stop_outcome': pick(OUTCOMES),
+        'is_arrested': arrested,
+        'stop_duration': pick(DURATIONS),
+        'drugs_related_stop': rng.random(n) < 0.009,
+    })
+
+
+class Recorder:
+    """Collect one result row per timed stage."""
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.results = []
+
+    def stage(self, rows, name, func, *args):
+        gc.collect()
+        if self.memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        value = func(*args)
+        seconds = time.perf_counter() - start
+        peak = None
+        if self.memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        self.results.append({'rows': rows, 'stage': name,
+                             'seconds': round(seconds, 6), 'peak_bytes': peak})
+        print("%10d  %-40s %9.3f s" % (rows, name, seconds), file=sys.stderr)
+        return value
+
+
+def bench_size(rec, rows, workdir):
+    path = os.path.join(workdir, 'stops_%d.csv' % rows)
+    synthetic_stops(rows).to_csv(path, index=False)
+
+    raw = rec.stage(rows, 'csv_parse', pd.read_csv, path)
+    df = rec.stage(rows, 'clean_and_merge', data_loader.clean_stops, raw)
+    del raw
+    df = rec.stage(rows, 'apply_schema', data_loader.apply_schema, df)
+
+    results = {}
+    for name, query in queries.QUERIES.items():
+        results[name] = rec.stage(rows, 'query:' + name, queries.run_frame, df, query)
+
+    cube = results['cube']
+    for hue in aggregates.POPULATION:
+        for measure in aggregates.MEASURES:
+            rec.stage(rows, 'rate_table:%s:%s' % (hue, measure),
+                      aggregates.rate_table, cube, hue, measure)
+    for column in ('driver_race', 'driver_gender'):
+        rec.stage(rows, 'speeding_by_age:' + column, aggregates.speeding_by_age,
+                  results['speeding_' + column], column)
+    for column in ('violation', 'stop_outcome', 'search_type_agg'):
+        rec.stage(rows, 'daily_counts:' + column, aggregates.daily_counts,
+                  results['daily_' + column], column)
+    rec.stage(rows, 'drug_counts', aggregates.drug_counts, results['drug_stops'])
+
+    year = df[df.year == 2010][['stop_date', 'driver_gender', 'driver_age',
+                                'driver_race', 'violation']]
+    for fmt in export.FORMATS:
+        rec.stage(rows, 'export:' + fmt, export.serialize, year, fmt)
+    os.remove(path)
+
+
+def compare(results, baseline):
+    """Print the time ratio of every stage against a baseline result file."""
+    before = {(r['rows'], r['stage']): r['seconds'] for r in baseline['results']}
+    for r in results:
+        old = before.get((r['rows'], r['stage']))
+        if old:
+            print("%10d  %-40s %6.2fx" % (r['rows'], r['stage'], r['seconds'] / old),
+                  file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--output', help="JSON result file (default: stdout)")
+    parser.add_argument('--baseline', help="earlier result file to compare with")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip tracemalloc, which slows some stages down")
+    args = parser.parse_args(argv)
+
+    rec = Recorder(memory=not args.no_memory)
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.sizes:
+            bench_size(rec, rows, workdir)
+
+    report = {'meta': {'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+                       'python': platform.python_version(),
+                       'pandas': pd.__version__,
+                       'numpy': np.__version__,
+                       'machine': platform.machine(),
+                       'cpus': os.cpu_count(),
+                       'memory_profiled': rec.memory},
+              'results': rec.results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(rec.results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
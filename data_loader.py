@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+"""
+Loading and enrichment of the police stops dataset.
+
+The cleaning steps (date and hour parsing, search type filling, age binning,
+search_type_agg and the census population joins) run once per process and the
+prepared frame is shared by every Streamlit session and rerun. The cache is
+keyed on the source file's path, mtime and hash so a replaced CSV is picked up
+on the next access, and invalidate() drops it explicitly.
+
+The prepared frame is also written as an uncompressed Arrow (Feather) snapshot
+next to the source file. New processes memory-map that snapshot instead of
+parsing the CSV again. The snapshot carries a version and the source hash in
+its schema metadata, and a stale or mismatched snapshot is rebuilt.
+
+The cached frame is a zero-copy view of that mapping for every column but the
+bools, so the page cache holds one copy per host whatever the number of
+processes. The frame is read-only: its arrays are marked non-writeable and
+load_stops() hands out shallow copies, so pages cannot change it for others.
+
+apply_schema() narrows the cleaned frame before it is cached: labels become
+categoricals, ages, hours and years small integers, and the flags real bools.
+
+The data path may also point at a partitioned Parquet store written by
+ingest.py (state=XX/year=YYYY directories). read_store() then reads only the
+partitions matching the requested states and years. Tools that change a
+store in place must touch its root directory, which keys its version.
+POLICE_DATA overrides the default data path and POLICE_STATES (comma
+separated) limits the states loaded.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+
+import instrument
+
+DATA_PATH = os.environ.get('POLICE_DATA', "police_project.csv")
+STATES = [s for s in os.environ.get('POLICE_STATES', '').split(',') if s] or None
+
+# Columns of the raw police_project.csv layout used by clean_stops().
+RAW_COLUMNS = ['stop_date', 'stop_time', 'county_name', 'driver_gender',
+               'driver_age_raw', 'driver_age', 'driver_race', 'violation_raw',
+               'violation', 'search_conducted', 'search_type', 'stop_outcome',
+               'is_arrested', 'stop_duration', 'drugs_related_stop']
+
+race_pop = {'driver_race': ['White', 'Black', 'Asian', 'Hispanic', 'Other'],
+            'race_population': [863105, 95783, 38945, 178936, 124202]}
+
+age_pop = {'driver_age_group': ['6 to 18', '19 to 64', '65 to 100'],
+           'age_population': [195777, 607331, 198935]}
+
+gender_pop = {'driver_gender': ['M', 'F'],
+              'gender_population': [516810, 535757]}
+
+AGE_BINS = [0, 5, 18, 64, 100]
+AGE_LABELS = ['0 to 5', '6 to 18', '19 to 64', '65 to 100']
+
+AGE_GROUP_DTYPE = pd.CategoricalDtype(AGE_LABELS, ordered=True)
+
+SCHEMA = {'state': 'category',
+          'driver_gender': 'category',
+          'driver_race': 'category',
+          'violation_raw': 'category',
+          'violation': 'category',
+          'search_type': 'category',
+          'search_type_agg': 'category',
+          'stop_outcome': 'category',
+          'stop_duration': 'category',
+          'driver_age_group': AGE_GROUP_DTYPE,
+          'driver_age': 'int8',
+          'driver_age_raw': 'int16',
+          'stop_time': 'int8',
+          'year': 'int16',
+          'search_conducted': 'bool',
+          'is_arrested': 'bool',
+          'drugs_related_stop': 'bool',
+          'race_population': 'float32',
+          'age_population': 'float32',
+          'gender_population': 'float32'}
+
+# Bump whenever clean_stops() or SCHEMA changes what is produced.
+SNAPSHOT_VERSION = 3
+SNAPSHOT_DIR = ".snapshots"
+SNAPSHOT_META = b'police_snapshot'
+
+_lock = threading.RLock()
+_cache = {}
+_results = {}
+_hashes = {}
+_pending = {}
+
+
+def clean_stops(df):
+    """Apply the cleaning and population joins to a raw stops frame."""
+    df['stop_date'] = pd.to_datetime(df['stop_date'], format='%Y-%m-%d')
+    df["stop_time"] = pd.to_datetime(df.stop_time, format="%H:%M").dt.hour
+    df = df.drop('county_name', axis=1, errors='ignore')
+    df['search_type'] = df['search_type'].replace([np.nan], 'Search not Conducted')
+    df = df.dropna()
+    df["year"] = df.stop_date.dt.year
+    df = df.assign(bins=pd.cut(df["driver_age"], AGE_BINS, labels=AGE_LABELS))
+    df = df.rename(columns={'bins': 'driver_age_group'})
+    df['search_type_agg'] = df.search_type.str.split(',').str[0]
+    df = df.merge(pd.DataFrame(race_pop), on='driver_race', how='left')
+    df = df.merge(pd.DataFrame(age_pop), on='driver_age_group', how='left')
+    df = df.merge(pd.DataFrame(gender_pop), on='driver_gender', how='left')
+    return df
+
+
+def apply_schema(df):
+    """Convert the cleaned frame to the compact dtypes in SCHEMA."""
+    return df.astype({c: t for c, t in SCHEMA.items() if c in df.columns})
+
+
+def as_labels(frame):
+    """Return frame with categorical columns as plain labels for plotting."""
+    cats = frame.select_dtypes('category').columns
+    return frame.astype({c: object for c in cats})
+
+
+def bytes_per_row(df):
+    """Return the deep memory footprint of df divided by its row count."""
+    return float(df.memory_usage(deep=True).sum() / max(len(df), 1))
+
+
+def _file_hash(path, mtime, size):
+    # Hashing is only repeated when the file's mtime or size changes.
+    key = (path, mtime, size)
+    if key not in _hashes:
+        h = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        _hashes[key] = h.hexdigest()
+    return _hashes[key]
+
+
+def _store_hash(path):
+    # A store is identified by its file listing rather than its contents. The
+    # listing is only walked again when the store root's inode or mtime
+    # changes: ingest.py builds a new root, and appends touch it.
+    st = os.stat(path)
+    key = (path, st.st_ino, st.st_mtime_ns)
+    if key not in _hashes:
+        _hashes[key] = _walk_store(path)
+    return _hashes[key]
+
+
+def _walk_store(path):
+    h = hashlib.sha1()
+    mtime = 0
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith('.parquet'):
+                st = os.stat(os.path.join(root, name))
+                mtime = max(mtime, st.st_mtime)
+                h.update(('%s/%s:%d:%f\n' % (os.path.relpath(root, path), name,
+                                              st.st_size, st.st_mtime)).encode('utf-8'))
+    return mtime, h.hexdigest()
+
+
+def dataset_key(path=DATA_PATH):
+    """Return the (path, mtime, sha1) tuple identifying the source file or store."""
+    path = os.path.abspath(path)
+    if os.path.isdir(path):
+        return (path,) + _store_hash(path)
+    st = os.stat(path)
+    return path, st.st_mtime, _file_hash(path, st.st_mtime, st.st_size)
+
+
+def read_store(store, states=None, years=None, columns=None):
+    """Read a partitioned store, touching only the given states and years."""
+    dataset = ds.dataset(store, format='parquet', partitioning='hive')
+    condition = None
+    if states is not None:
+        condition = ds.field('state').isin(list(states))
+    if years is not None:
+        by_year = ds.field('year').isin([int(y) for y in years])
+        condition = by_year if condition is None else condition & by_year
+    table = dataset.to_table(columns=columns, filter=condition)
+    return apply_schema(table.to_pandas())
+
+
+def snapshot_path(path=DATA_PATH):
+    """Return where the columnar snapshot of path is stored."""
+    path = os.path.abspath(path)
+    name = os.path.splitext(os.path.basename(path))[0] + '.arrow'
+    return os.path.join(os.path.dirname(path), SNAPSHOT_DIR, name)
+
+
+def snapshot_info(path=DATA_PATH):
+    """Return the metadata stamped on the snapshot of path, or None."""
+    snap = snapshot_path(path)
+    if not os.path.exists(snap):
+        return None
+    try:
+        with pa.memory_map(snap) as source:
+            meta = pa.ipc.open_file(source).schema.metadata or {}
+    except (pa.ArrowInvalid, OSError):
+        return None
+    if SNAPSHOT_META not in meta:
+        return None
+    return json.loads(meta[SNAPSHOT_META])
+
+
+def _snapshot_valid(path, key):
+    info = snapshot_info(path)
+    return (info is not None and info['version'] == SNAPSHOT_VERSION
+            and info['source_sha1'] == key[2])
+
+
+def write_snapshot(df, path, key, extra=None):
+    """Write df as the snapshot of path, replacing any previous one atomically."""
+    snap = snapshot_path(path)
+    os.makedirs(os.path.dirname(snap), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    stamp = {'version': SNAPSHOT_VERSION, 'source_sha1': key[2],
+             'rows': len(df),
+             'schema': {c: str(t) for c, t in df.dtypes.items()}}
+    stamp.update(extra or {})
+    meta = dict(table.schema.metadata or {})
+    meta[SNAPSHOT_META] = json.dumps(stamp).encode('utf-8')
+    table = table.replace_schema_metadata(meta)
+    tmp = '%s.%d.tmp' % (snap, os.getpid())
+    # One record batch, so every column maps back as a single zero-copy view;
+    # the default 64K-row batches make to_pandas() copy chunked columns.
+    feather.write_feather(table, tmp, compression='uncompressed',
+                          chunksize=max(len(df), 1))
+    os.replace(tmp, snap)
+    return snap
+
+
+def read_snapshot(path=DATA_PATH, columns=None, years=None):
+    """Memory-map the snapshot of path, reading only the given columns and years."""
+    if years is None:
+        table = feather.read_table(snapshot_path(path), columns=columns,
+                                   memory_map=True)
+        # One block per column keeps the columns as views of the mapping.
+        return table.to_pandas(split_blocks=True)
+    dataset = ds.dataset(snapshot_path(path), format='feather')
+    table = dataset.to_table(columns=columns,
+                             filter=ds.field('year').isin([int(y) for y in years]))
+    return table.to_pandas()
+
+
+def _freeze(df):
+    # Returns the bytes that were already read-only: the buffers pyarrow
+    # mapped from the snapshot without copying.
+    mapped = 0
+    for block in df._mgr.blocks:
+        values = block.values
+        array = getattr(values, '_codes', None)
+        if array is None:
+            array = getattr(values, '_ndarray', values)
+        if not array.flags.writeable:
+            mapped += array.nbytes
+        array.flags.writeable = False
+    return mapped
+
+
+def dataset_version(path=DATA_PATH):
+    """Return the source hash identifying the current version of the dataset."""
+    return dataset_key(path)[2]
+
+
+def _load(path, key):
+    start = time.perf_counter()
+    if os.path.isdir(path):
+        with instrument.stage('load:store') as stage:
+            df = read_store(path, STATES)
+            stage['rows'] = len(df)
+        source = 'store'
+        before = None
+    elif _snapshot_valid(path, key):
+        with instrument.stage('load:snapshot') as stage:
+            df = read_snapshot(path)
+            stage['rows'] = len(df)
+        source = 'snapshot'
+        before = snapshot_info(path).get('bytes_per_row_before')
+    else:
+        with instrument.stage('load:csv') as stage:
+            df = pd.read_csv(path)
+            stage['rows'] = len(df)
+        with instrument.stage('load:clean', rows=len(df)):
+            df = clean_stops(df)
+            before = bytes_per_row(df)
+            df = apply_schema(df)
+        with instrument.stage('load:write_snapshot', rows=len(df)):
+            write_snapshot(df, path, key, {'bytes_per_row_before': before})
+            # Serve the mapped snapshot so this process shares it as well.
+            df = read_snapshot(path)
+        source = 'csv'
+    stats = {'path': key[0], 'mtime': key[1], 'sha1': key[2],
+             'source': source,
+             'rows': len(df),
+             'load_seconds': time.perf_counter() - start,
+             'memory_bytes': int(df.memory_usage(deep=True).sum()),
+             'bytes_per_row_before': before,
+             'bytes_per_row': bytes_per_row(df)}
+    stats['shared_bytes'] = _freeze(df)
+    stats['private_bytes'] = stats['memory_bytes'] - stats['shared_bytes']
+    instrument.set_gauge('police_dataset_shared_bytes', stats['shared_bytes'])
+    instrument.set_gauge('police_dataset_private_bytes', stats['private_bytes'])
+    return {'key': key, 'df': df, 'stats': stats}
+
+
+def _claim(token):
+    # Called under _lock. Returns None if this thread should build token,
+    # otherwise the event set once the thread already building it is done.
+    event = _pending.get(token)
+    if event is None:
+        _pending[token] = threading.Event()
+    return event
+
+
+def _release(token):
+    with _lock:
+        event = _pending.pop(token)
+    event.set()
+
+
+def _entry(path):
+    # Loads run outside _lock so lookups of other entries never wait on them.
+    key = dataset_key(path)
+    token = ('load', key)
+    while True:
+        with _lock:
+            entry = _cache.get(key[0])
+            if entry is not None and entry['key'] == key:
+                return entry
+            event = _claim(token)
+        if event is None:
+            break
+        event.wait()
+    try:
+        entry = _load(path, key)
+        with _lock:
+            _cache[key[0]] = entry
+    finally:
+        _release(token)
+    return entry
+
+
+def load_stops(path=DATA_PATH, columns=None, years=None):
+    """Return the prepared stops frame, building it on first use.
+
+    With columns and/or years, only those columns and the stops of those
+    years are returned. If the full frame is not loaded in this process yet
+    they are read on their own from the store partitions or the snapshot.
+    """
+    if columns is None and years is None:
+        return _entry(path)['df'].copy(deep=False)
+    key = dataset_key(path)
+    with _lock:
+        entry = _cache.get(key[0])
+        loaded = entry is not None and entry['key'] == key
+    if not loaded and os.path.isdir(path):
+        return read_store(path, STATES, years, columns)
+    if not loaded and not _snapshot_valid(path, key):
+        entry, loaded = _entry(path), True
+    if not loaded:
+        return read_snapshot(path, columns, years)
+    df = entry['df'].copy(deep=False)
+    if years is not None:
+        df = df[df.year.isin(list(years))]
+    return df if columns is None else df[list(columns)]
+
+
+def cached(name, build, path=DATA_PATH):
+    """Return build() for the current dataset version, computing it only once.
+
+    Results are dropped when the source changes or invalidate() is called.
+    build() runs outside the lock: concurrent callers of the same name wait
+    for the first one, while lookups of other names are not held up.
+    """
+    key = dataset_key(path)
+    token = ('result', key, name)
+    while True:
+        with _lock:
+            results = _results.get(key[0])
+            if results is None or results['key'] != key:
+                results = _results[key[0]] = {'key': key, 'values': {}}
+            if name in results['values']:
+                return results['values'][name]
+            event = _claim(token)
+        if event is None:
+            break
+        # Another thread is building this result; wait for it, then look again.
+        event.wait()
+    label = ':'.join(map(str, name)) if isinstance(name, tuple) else name
+    try:
+        with instrument.stage(label):
+            value = build()
+        with _lock:
+            results['values'][name] = value
+    finally:
+        _release(token)
+    return value
+
+
+def ensure_snapshot(path=DATA_PATH):
+    """Return the snapshot path of a CSV source, building it if it is stale."""
+    if not _snapshot_valid(path, dataset_key(path)):
+        _entry(path)
+    return snapshot_path(path)
+
+
+def load_stats(path=DATA_PATH, load=True):
+    """Return load time, row count and memory footprint of the prepared frame.
+
+    With load=False, returns None instead of loading a frame that is not in
+    memory yet.
+    """
+    if not load:
+        key = dataset_key(path)
+        entry = _cache.get(key[0])
+        if entry is None or entry['key'] != key:
+            return None
+        return dict(entry['stats'])
+    return dict(_entry(path)['stats'])
+
+
+def column_names(path=DATA_PATH):
+    """Return the columns of the prepared frame without loading its rows."""
+    key = dataset_key(path)
+    entry = _cache.get(key[0])
+    if entry is not None and entry['key'] == key:
+        return list(entry['df'].columns)
+    if os.path.isdir(path):
+        return ds.dataset(path, format='parquet', partitioning='hive').schema.names
+    with pa.memory_map(ensure_snapshot(path)) as source:
+        return pa.ipc.open_file(source).schema.names
+
+
+def invalidate(path=None):
+    """Drop the cached frame for path, or every cached frame if path is None."""
+    with _lock:
+        if path is None:
+            _cache.clear()
+            _results.clear()
+            _hashes.clear()
+        else:
+            path = os.path.abspath(path)
+            _cache.pop(path, None)
+            _results.pop(path, None)
+            for key in [k for k in _hashes if k[0] == path]:
+                del _hashes[key]
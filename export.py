@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+On-demand export of the Sample Data Explorer selection.
+
+Files are only serialized when a download is requested, are written in row
+chunks rather than one to_csv() string, and are kept in a small process-wide
+LRU cache so repeated requests for the same selection are served from memory.
+"""
+
+import gzip
+import io
+import threading
+from collections import OrderedDict
+
+FORMATS = {'CSV': ('csv', 'text/csv'),
+           'Gzipped CSV': ('csv.gz', 'application/gzip'),
+           'Parquet': ('parquet', 'application/octet-stream')}
+
+CHUNK_ROWS = 50000
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+
+
+def write_csv(frame, out, chunk_rows=CHUNK_ROWS):
+    """Write frame as UTF-8 CSV to the binary stream out, chunk_rows at a time."""
+    text = io.TextIOWrapper(out, encoding='utf-8', newline='', write_through=True)
+    frame.iloc[:0].to_csv(text)
+    for start in range(0, len(frame), chunk_rows):
+        frame.iloc[start:start + chunk_rows].to_csv(text, header=False)
+    text.detach()
+
+
+def serialize(frame, fmt):
+    """Return frame serialized in one of FORMATS."""
+    buf = io.BytesIO()
+    if fmt == 'CSV':
+        write_csv(frame, buf)
+    elif fmt == 'Gzipped CSV':
+        with gzip.GzipFile(fileobj=buf, mode='wb', mtime=0) as gz:
+            write_csv(frame, gz)
+    elif fmt == 'Parquet':
+        frame.to_parquet(buf)
+    else:
+        raise ValueError("Unknown export format: %s" % fmt)
+    return buf.getvalue()
+
+
+def export(key, build_frame, fmt, max_bytes=MAX_CACHE_BYTES):
+    """Return the serialized selection identified by key.
+
+    build_frame is only called on a cache miss. key must identify the dataset
+    version and the selection; the format is added to it here.
+    """
+    key = (key, fmt)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    data = serialize(build_frame(), fmt)
+    with _lock:
+        _cache[key] = data
+        _cache.move_to_end(key)
+        total = sum(len(v) for v in _cache.values())
+        while total > max_bytes and len(_cache) > 1:
+            _, dropped = _cache.popitem(last=False)
+            total -= len(dropped)
+    return data
+
+
+def clear():
+    """Drop every cached export."""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Per-value row indexes for filtering the prepared stops frame.
+
+For each indexed column, build_index() stores the sorted row positions holding
+each value. A filter (column -> values to keep) is then resolved by joining
+the position arrays of its values and intersecting across columns, smallest
+first, without scanning the frame. take() materializes only the matching rows
+of the chosen columns.
+
+year_index() indexes one year at a time, cached per dataset version. When the
+prepared frame is shared (a snapshot source, or a frame already loaded) the
+positions point into it and no rows are copied; a store whose frame is not
+loaded has only that year's partitions read instead.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+INDEXED = ['stop_time', 'driver_race', 'driver_gender', 'violation',
+           'stop_outcome']
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _codes(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    return pd.factorize(series, sort=True)
+
+
+def build_index(df, rows=None, columns=INDEXED):
+    """Map each column in columns to {value: sorted row positions}.
+
+    With rows (sorted positions), only those rows of df are indexed.
+    """
+    dtype = np.int32 if len(df) < 2 ** 31 else np.int64
+    index = {}
+    for column in columns:
+        codes, values = _codes(df[column])
+        if rows is None:
+            order = np.argsort(codes, kind='stable').astype(dtype)
+        else:
+            codes = codes[rows]
+            order = rows[np.argsort(codes, kind='stable')].astype(dtype)
+        counts = np.bincount(codes[codes >= 0], minlength=len(values))
+        # Missing values have code -1 and sort first.
+        ends = len(codes) - counts.sum() + np.cumsum(counts)
+        index[column] = {value: order[end - count:end]
+                         for value, count, end in zip(values.tolist(), counts, ends)
+                         if count}
+    return index
+
+
+def _year_rows(df, year):
+    return np.flatnonzero(df['year'].to_numpy() == year)
+
+
+def year_index(year, path=data_loader.DATA_PATH):
+    """Return a frame, the positions of year's stops in it and their row index."""
+    if os.path.isdir(path) and data_loader.load_stats(path, load=False) is None:
+        def build():
+            df = data_loader.load_stops(path, years=[year])
+            return df, np.arange(len(df)), build_index(df)
+        return data_loader.cached(('row_index', 'partition', year), build, path)
+    df = data_loader.load_stops(path)
+
+    def build():
+        rows = _year_rows(df, year)
+        return rows, build_index(df, rows)
+    rows, index = data_loader.cached(('row_index', year), build, path)
+    return df, rows, index
+
+
+def select(index, spec, rows):
+    """Return the sorted positions of the rows matching every filter in spec.
+
+    spec maps indexed columns to the values to keep; an empty selection
+    leaves that column unfiltered. rows holds the positions of every indexed
+    row, returned when nothing is filtered.
+    """
+    picked = []
+    for column, values in spec.items():
+        if not values:
+            continue
+        parts = [index[column].get(value, _EMPTY) for value in values]
+        picked.append(parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts)))
+    if not picked:
+        return rows
+    picked.sort(key=len)
+    positions = picked[0]
+    for other in picked[1:]:
+        if not len(positions):
+            break
+        positions = np.intersect1d(positions, other, assume_unique=True)
+    return positions
+
+
+def take(df, positions, columns):
+    """Return the rows at positions, with only the chosen columns."""
+    return df.iloc[positions, [df.columns.get_loc(c) for c in columns]]
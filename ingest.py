@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Chunked ingestion of Open Policing CSV files into a partitioned Parquet store.
+
+Each source is read chunksize rows at a time, cleaned with the same steps as
+the app's loader and appended to a store partitioned by state and year:
+
+    python ingest.py ri_statewide.csv ct_statewide.csv --store store
+    python ingest.py police_project.csv --store store --state RI
+
+Point the app at the store with POLICE_DATA=store, and run
+"python refresh.py --data store" to precompute its aggregates. Sources need
+the columns of police_project.csv; a state column is used when present,
+otherwise --state.
+
+New batches (say a month of stops) are added with --append. Only the batch is
+cleaned, its files are moved into the existing partitions, and the published
+aggregates are updated by merging in the batch's own query results:
+
+    python ingest.py stops_2016_01.csv --store store --state RI --append
+"""
+
+import argparse
+import os
+import shutil
+import time
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+import artifacts
+import data_loader
+import queries
+
+CHUNK_ROWS = 500000
+PARTITIONS = ['state', 'year']
+
+
+def prepare_chunk(chunk, state=None):
+    """Clean a raw chunk into the column types stored in every partition."""
+    if 'state' not in chunk.columns:
+        if state is None:
+            raise ValueError("source has no state column, pass --state")
+        chunk['state'] = state
+    chunk = data_loader.clean_stops(chunk)
+    # Labels are stored as plain strings so every file shares one schema; the
+    # reader turns them back into categoricals.
+    return data_loader.as_labels(data_loader.apply_schema(chunk))
+
+
+def read_chunks(source, chunksize=CHUNK_ROWS):
+    """Yield raw chunks of source restricted to the columns the loader uses."""
+    wanted = set(data_loader.RAW_COLUMNS) | {'state'}
+    return pd.read_csv(source, usecols=lambda c: c in wanted,
+                       chunksize=chunksize)
+
+
+def write_chunk(frame, store):
+    """Append a prepared chunk to the store as new files in its partitions."""
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    ds.write_dataset(table, store, format='parquet',
+                     partitioning=PARTITIONS, partitioning_flavor='hive',
+                     basename_template='part-%s-{i}.parquet' % uuid.uuid4().hex,
+                     existing_data_behavior='overwrite_or_ignore')
+
+
+def ingest(sources, store, state=None, chunksize=CHUNK_ROWS):
+    """Build a fresh store from sources, replacing store only once complete."""
+    tmp = '%s.tmp-%d' % (store.rstrip(os.sep), os.getpid())
+    shutil.rmtree(tmp, ignore_errors=True)
+    rows = 0
+    for source in sources:
+        for chunk in read_chunks(source, chunksize):
+            frame = prepare_chunk(chunk, state)
+            if len(frame):
+                write_chunk(frame, tmp)
+                rows += len(frame)
+    if os.path.exists(store):
+        old = '%s.old-%d' % (store.rstrip(os.sep), os.getpid())
+        os.rename(store, old)
+        os.rename(tmp, store)
+        shutil.rmtree(old)
+    else:
+        os.rename(tmp, store)
+    return rows
+
+
+def append(sources, store, state=None, chunksize=CHUNK_ROWS):
+    """Add sources to an existing store and update its aggregates by delta.
+
+    Returns the number of stops added and whether the published aggregates
+    were updated; they are left alone when they were stale or incomplete, in
+    which case refresh.py has to rebuild them.
+    """
+    if not os.path.isdir(store):
+        raise ValueError("%s is not a store, build it with ingest.py first" % store)
+    info = artifacts.manifest(store)
+    tmp = '%s.batch-%d' % (store.rstrip(os.sep), os.getpid())
+    shutil.rmtree(tmp, ignore_errors=True)
+    rows = 0
+    deltas = {name: [] for name in queries.QUERIES}
+    for source in sources:
+        for chunk in read_chunks(source, chunksize):
+            frame = prepare_chunk(chunk, state)
+            if not len(frame):
+                continue
+            write_chunk(frame, tmp)
+            rows += len(frame)
+            if info is not None:
+                frame = data_loader.apply_schema(frame)
+                if data_loader.STATES:
+                    frame = frame[frame.state.isin(data_loader.STATES)]
+                for name, query in queries.QUERIES.items():
+                    deltas[name].append(queries.run_frame(frame, query))
+
+    results = None
+    if info is not None:
+        results = {}
+        for name, query in queries.QUERIES.items():
+            stored = artifacts.read(name, store)
+            if stored is None:
+                # The batch alone is not the query's result; leave the stale
+                # aggregates for refresh.py to rebuild.
+                results = None
+                break
+            results[name] = queries.merge_frames(query, [stored] + deltas[name])
+
+    if os.path.isdir(tmp):
+        for root, dirs, files in os.walk(tmp):
+            target = os.path.join(store, os.path.relpath(root, tmp))
+            os.makedirs(target, exist_ok=True)
+            for name in files:
+                os.rename(os.path.join(root, name), os.path.join(target, name))
+        shutil.rmtree(tmp)
+        # The store's version is keyed on its root directory's mtime.
+        os.utime(store)
+    if results is not None:
+        artifacts.publish(results, data_loader.dataset_version(store), store,
+                          {'appended_rows': rows})
+    return rows, results is not None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('sources', nargs='+', help="raw stops CSV files")
+    parser.add_argument('--store', required=True, help="output store directory")
+    parser.add_argument('--state', help="state code for sources without a state column")
+    parser.add_argument('--chunksize', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--append', action='store_true',
+                        help="add the sources to an existing store instead of rebuilding it")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.append:
+        rows, updated = append(args.sources, args.store, args.state, args.chunksize)
+        print("Appended %d stops to %s in %.1f s" % (rows, args.store, time.perf_counter() - start))
+        if not updated:
+            print("Aggregates were missing or stale; run refresh.py --data %s" % args.store)
+        return
+    rows = ingest(args.sources, args.store, args.state, args.chunksize)
+    print("Wrote %d stops to %s in %.1f s"
+          % (rows, args.store, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
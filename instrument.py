@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Hot-path instrumentation for live sessions.
+
+Code paths wrap their work in stage(name, rows=...). Each stage records wall
+time, the rows it scanned when known (set rows up front or on the yielded
+entry), and the bytes allocated while it ran. Stages nest; depth is recorded.
+Stages are collected per rerun (per script thread) for the debug panel in the
+sidebar, and summed per process for monitoring:
+
+- POLICE_DEBUG=1: offer the stage timing panel in the sidebar.
+- POLICE_METRICS_FILE: a Prometheus text-format file rewritten after reruns.
+- POLICE_PROFILE_LOG=1: one JSON log line per rerun with all its stages.
+- POLICE_TRACE_MEMORY=1: start tracemalloc so stages report bytes allocated.
+  The figure is the net change of traced memory, so stages running in other
+  sessions at the same time are included in it.
+
+This module must stay light to import: the app imports it before any page.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+METRICS_FILE = os.environ.get('POLICE_METRICS_FILE')
+METRICS_INTERVAL = 10.0
+PROFILE_LOG = os.environ.get('POLICE_PROFILE_LOG') == '1'
+DEBUG_PANEL = os.environ.get('POLICE_DEBUG') == '1'
+
+if os.environ.get('POLICE_TRACE_MEMORY') == '1':
+    tracemalloc.start()
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+_lock = threading.Lock()
+_totals = {}
+_gauges = {}
+_last_write = [0.0]
+
+
+def start_run(page=None):
+    """Begin collecting stages for a new rerun in this thread."""
+    _local.page = page
+    _local.stages = []
+    _local.depth = 0
+
+
+def run_stages():
+    """Return the finished stages of this thread's rerun, in start order."""
+    return [entry for entry in getattr(_local, 'stages', [])
+            if entry['seconds'] is not None]
+
+
+@contextmanager
+def stage(name, rows=None):
+    """Time the enclosed block and record it as a stage.
+
+    Yields the stage entry, so the block can fill in rows once known.
+    """
+    tracing = tracemalloc.is_tracing()
+    before = tracemalloc.get_traced_memory()[0] if tracing else None
+    depth = getattr(_local, 'depth', 0)
+    entry = {'stage': name, 'seconds': None, 'rows': rows, 'bytes': None,
+             'depth': depth}
+    stages = getattr(_local, 'stages', None)
+    if stages is not None:
+        stages.append(entry)
+    _local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        entry['seconds'] = time.perf_counter() - start
+        _local.depth = depth
+        if tracing and tracemalloc.is_tracing():
+            entry['bytes'] = tracemalloc.get_traced_memory()[0] - before
+        _add_total(entry)
+
+
+def _add_total(entry):
+    name, seconds, rows, allocated = (entry['stage'], entry['seconds'],
+                                      entry['rows'], entry['bytes'])
+    with _lock:
+        total = _totals.setdefault(name, {'calls': 0, 'seconds': 0.0, 'rows': 0,
+                                          'bytes': 0, 'max_seconds': 0.0})
+        total['calls'] += 1
+        total['seconds'] += seconds
+        total['rows'] += rows or 0
+        total['bytes'] += max(allocated or 0, 0)
+        total['max_seconds'] = max(total['max_seconds'], seconds)
+
+
+def totals():
+    """Return per-stage call counts and sums for this process."""
+    with _lock:
+        return {name: dict(t) for name, t in _totals.items()}
+
+
+def set_gauge(metric, value):
+    """Set a process-level gauge exported alongside the stage totals."""
+    with _lock:
+        _gauges[metric] = value
+
+
+def prometheus_text():
+    """Render the process totals in the Prometheus text exposition format."""
+    lines = []
+    metrics = [('calls', 'police_stage_calls_total', 'counter', "Stage executions"),
+               ('seconds', 'police_stage_seconds_total', 'counter', "Wall time spent in stage"),
+               ('rows', 'police_stage_rows_total', 'counter', "Rows scanned by stage"),
+               ('bytes', 'police_stage_bytes_total', 'counter', "Bytes allocated by stage"),
+               ('max_seconds', 'police_stage_seconds_max', 'gauge', "Slowest stage execution")]
+    current = totals()
+    for field, metric, kind, help_text in metrics:
+        lines.append('# HELP %s %s' % (metric, help_text))
+        lines.append('# TYPE %s %s' % (metric, kind))
+        for name in sorted(current):
+            label = name.replace('\\', '\\\\').replace('"', '\\"')
+            lines.append('%s{stage="%s"} %s' % (metric, label, repr(current[name][field])))
+    with _lock:
+        gauges = dict(_gauges)
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows; the RSS gauge is left out there.
+        pass
+    else:
+        gauges['police_process_peak_rss_bytes'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    for metric in sorted(gauges):
+        lines.append('# TYPE %s gauge' % metric)
+        lines.append('%s %s' % (metric, repr(gauges[metric])))
+    return '\n'.join(lines) + '\n'
+
+
+def write_metrics(path=METRICS_FILE):
+    """Atomically rewrite the metrics file."""
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    with open(tmp, 'w') as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+def finish_run():
+    """Close this thread's rerun: log its stages and refresh the metrics file."""
+    stages = run_stages()
+    if PROFILE_LOG and stages:
+        logger.info(json.dumps({'event': 'rerun', 'page': getattr(_local, 'page', None),
+                                'pid': os.getpid(), 'stages': stages}))
+    if METRICS_FILE:
+        now = time.monotonic()
+        with _lock:
+            due = now - _last_write[0] >= METRICS_INTERVAL
+            if due:
+                _last_write[0] = now
+        if due:
+            write_metrics()
+    return stages
+
+
+def format_stages(stages):
+    """Return stages as an indented plain-text table for the debug panel."""
+    lines = ['%-38s %9s %10s %10s' % ('stage', 'ms', 'rows', 'KB')]
+    for entry in stages:
+        lines.append('%-38s %9.1f %10s %10s' % (
+            ('  ' * entry['depth'] + entry['stage'])[:38],
+            entry['seconds'] * 1000,
+            '' if entry['rows'] is None else entry['rows'],
+            '' if entry['bytes'] is None else '%.0f' % (entry['bytes'] / 1024)))
+    return '\n'.join(lines)
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Aggregations behind the analysis pages, expressed once and run on a backend.
+
+Each query is a small spec: the columns to group by, optional row filters and
+named aggregates. The pandas backend runs it as a groupby on the in-memory
+frame. The duckdb backend runs it as SQL over the Arrow snapshot or the
+partitioned store, so only the small result table is materialized. Choose the
+backend with POLICE_BACKEND (pandas by default).
+
+A spec aggregate is (column, func) with func one of count, sum and max, or
+(column, 'sum', value) to count the rows where column equals value. All of
+them are additive, so results computed on disjoint slices of the stops (for
+example one per year) combine with merge_frames(). refresh.py precomputes
+every query this way, and run() serves those artifacts when they match the
+dataset version.
+"""
+
+import os
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+import aggregates
+import artifacts
+import data_loader
+import instrument
+
+BACKEND = os.environ.get('POLICE_BACKEND', 'pandas')
+
+_count = ('stop_date', 'count')
+
+QUERIES = {
+    'violation_outcome': {
+        'by': ['violation', 'stop_outcome'],
+        'aggs': {'stops': _count}},
+    'violation_search_type': {
+        'by': ['violation', 'search_type_agg'],
+        'where': [('search_type', '!=', 'Search not Conducted')],
+        'aggs': {'stops': _count}},
+    'searches_by_violation': {
+        'by': ['year', 'violation'],
+        'where': [('search_conducted', '==', True)],
+        'aggs': {'search_conducted': _count}},
+    'arrests_by_violation': {
+        'by': ['year', 'violation'],
+        'where': [('is_arrested', '==', True)],
+        'aggs': {'is_arrested': _count}},
+    'drug_stops': {
+        'by': ['stop_time', 'driver_age_group', 'driver_race'],
+        'where': [('drugs_related_stop', '==', True)],
+        'aggs': {'count': _count,
+                 'age_population': ('age_population', 'max'),
+                 'race_population': ('race_population', 'max')}},
+    'cube': {
+        'by': aggregates.CUBE_DIMS,
+        'aggs': {'stops': _count,
+                 'searches': ('search_conducted', 'sum'),
+                 'arrests': ('is_arrested', 'sum'),
+                 'stop_time_sum': ('stop_time', 'sum'),
+                 'age_population': ('age_population', 'max'),
+                 'race_population': ('race_population', 'max'),
+                 'gender_population': ('gender_population', 'max')}},
+}
+
+for _column in ('violation', 'stop_outcome', 'search_type_agg'):
+    QUERIES['daily_' + _column] = {'by': [_column, 'stop_date'],
+                                   'aggs': {'stops': _count}}
+
+for _column in ('driver_race', 'driver_gender'):
+    QUERIES['speeding_' + _column] = {
+        'by': ['driver_age', _column],
+        'aggs': {'speeding': ('violation', 'sum', 'Speeding'),
+                 'population': (aggregates.POPULATION[_column], 'max')}}
+
+
+def run_frame(df, query):
+    """Run a query spec as a groupby on an in-memory stops frame."""
+    for column, op, value in query.get('where', []):
+        df = df[df[column] == value] if op == '==' else df[df[column] != value]
+    frame = df[query['by']].copy()
+    named = {}
+    for name, agg in query['aggs'].items():
+        column, func = agg[0], agg[1]
+        frame[name] = df[column] == agg[2] if len(agg) > 2 else df[column]
+        named[name] = (name, func)
+    result = frame.groupby(query['by'], observed=True).agg(**named)
+    # With several categorical keys pandas returns groups in order of first
+    # appearance; sort on the keys so the result does not depend on row order.
+    return result.reset_index().sort_values(query['by'], ignore_index=True)
+
+
+def query_columns(query):
+    """Return the stops columns a query spec reads."""
+    columns = list(query['by'])
+    columns += [column for column, op, value in query.get('where', [])]
+    columns += [agg[0] for agg in query['aggs'].values()]
+    return list(dict.fromkeys(columns))
+
+
+def merge_frames(query, frames):
+    """Combine results of query computed on disjoint slices of the stops."""
+    funcs = {name: 'max' if agg[1] == 'max' else 'sum'
+             for name, agg in query['aggs'].items()}
+    frames = list(frames)
+    for column in query['by']:
+        # Slices may hold different categories; concat would fall back to
+        # object, so give them the union first.
+        dtypes = [frame[column].dtype for frame in frames]
+        if all(isinstance(t, pd.CategoricalDtype) and not t.ordered for t in dtypes):
+            union = pd.CategoricalDtype(sorted(set().union(*[t.categories for t in dtypes])))
+            frames = [frame.astype({column: union}) for frame in frames]
+    frame = pd.concat(frames, ignore_index=True)
+    frame = frame.groupby(query['by'], observed=True).agg(funcs).reset_index()
+    return frame.sort_values(query['by'], ignore_index=True)
+
+
+class PandasBackend:
+    """Run query specs as groupbys on the prepared in-memory frame."""
+
+    def __init__(self, path=data_loader.DATA_PATH):
+        self.path = path
+
+    def run(self, query):
+        # A store is read column by column; only the query's columns are
+        # loaded. The snapshot frame is a shared mapping, used as is.
+        columns = query_columns(query) if os.path.isdir(self.path) else None
+        df = data_loader.load_stops(self.path, columns=columns)
+        with instrument.stage('groupby', rows=len(df)):
+            return run_frame(df, query)
+
+
+class DuckDBBackend:
+    """Run query specs as SQL over the on-disk columnar data."""
+
+    def __init__(self, path=data_loader.DATA_PATH):
+        import duckdb
+        self.path = path
+        self.duckdb = duckdb
+
+    def source(self):
+        if os.path.isdir(self.path):
+            return ds.dataset(self.path, format='parquet', partitioning='hive')
+        return ds.dataset(data_loader.ensure_snapshot(self.path), format='feather')
+
+    def sql(self, query):
+        select = list(query['by'])
+        for name, agg in query['aggs'].items():
+            column, func = agg[0], agg[1]
+            if len(agg) > 2:
+                expr = "SUM(CAST(%s = %s AS INTEGER))::BIGINT" % (column, _literal(agg[2]))
+            elif func == 'sum':
+                expr = "SUM(CAST(%s AS BIGINT))::BIGINT" % column
+            else:
+                expr = "%s(%s)" % (func.upper(), column)
+            select.append("%s AS %s" % (expr, name))
+        where = ["%s %s %s" % (c, '=' if op == '==' else '<>', _literal(v))
+                 for c, op, v in query.get('where', [])]
+        if os.path.isdir(self.path) and data_loader.STATES:
+            where.append("state IN (%s)" % ', '.join(_literal(s) for s in data_loader.STATES))
+        by = ', '.join(query['by'])
+        return ("SELECT %s FROM stops%s GROUP BY %s ORDER BY %s"
+                % (', '.join(select),
+                   ' WHERE ' + ' AND '.join(where) if where else '', by, by))
+
+    def run(self, query):
+        con = self.duckdb.connect()
+        try:
+            con.register('stops', self.source())
+            with instrument.stage('sql'):
+                return con.execute(self.sql(query)).df()
+        finally:
+            con.close()
+
+
+BACKENDS = {'pandas': PandasBackend, 'duckdb': DuckDBBackend}
+
+
+def _literal(value):
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, str):
+        return "'%s'" % value.replace("'", "''")
+    return repr(value)
+
+
+def run(name, backend=None, path=data_loader.DATA_PATH):
+    """Return the result table of a named query, cached per dataset version."""
+    backend = backend or BACKEND
+
+    def compute():
+        frame = artifacts.read(name, path)
+        if frame is None:
+            frame = BACKENDS[backend](path).run(QUERIES[name])
+        return frame
+    return data_loader.cached(('query', backend, name), compute, path)
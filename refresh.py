@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Precompute every page aggregate for the current dataset.
+
+Run after dropping in a new police_project.csv (or rebuilding the store) so no
+visitor pays for a cold page:
+
+    python refresh.py
+    python refresh.py --data store --workers 16
+
+The source is cleaned once with the loader's own steps (for a CSV this builds
+the Arrow snapshot). Every query in queries.QUERIES is then computed on each
+year of stops in a pool of worker processes, and the per-year partials are
+merged and published with artifacts.publish(). The app serves them from then
+on, as long as the dataset version matches.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import artifacts
+import data_loader
+import queries
+
+
+def _columns():
+    columns = []
+    for query in queries.QUERIES.values():
+        columns += queries.query_columns(query)
+    return list(dict.fromkeys(columns))
+
+
+def year_partials(path, year):
+    """Return every query's result on the stops of one year."""
+    df = data_loader.load_stops(path, columns=_columns(), years=[year])
+    return {name: queries.run_frame(df, query) for name, query in queries.QUERIES.items()}
+
+
+def years(path):
+    """Return the years present in the dataset."""
+    return sorted(int(y) for y in data_loader.load_stops(path, columns=['year'])['year'].unique())
+
+
+def compute(path=data_loader.DATA_PATH, workers=None):
+    """Return every query's result, computed per year in a process pool."""
+    if not os.path.isdir(path):
+        data_loader.ensure_snapshot(path)
+    partials = {name: [] for name in queries.QUERIES}
+    todo = years(path)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(year_partials, [path] * len(todo), todo):
+            for name, frame in result.items():
+                partials[name].append(frame)
+    return {name: queries.merge_frames(queries.QUERIES[name], frames)
+            for name, frames in partials.items() if frames}
+
+
+def refresh(path=data_loader.DATA_PATH, workers=None):
+    """Compute and publish the aggregates of path; return the artifact directory."""
+    version = data_loader.dataset_version(path)
+    results = compute(path, workers)
+    if data_loader.dataset_version(path) != version:
+        raise RuntimeError("%s changed during the refresh, run it again" % path)
+    return artifacts.publish(results, version, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--data', default=data_loader.DATA_PATH,
+                        help="source CSV or store directory (default: %(default)s)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    target = refresh(args.data, args.workers)
+    print("Published aggregates to %s in %.1f s" % (target, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Process-wide cache of Plotly figure specs.
+
+Entries are shared by every session and keyed on (page, widget values,
+dataset version), so the default view most visitors land on is built once.
+The cache is bounded by entry count and approximate size, evicting the least
+recently used entries first, and entries expire after a TTL. Figures are
+stored as JSON specs so each session gets its own Figure object.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+import plotly.io as pio
+
+import data_loader
+import instrument
+
+MAX_ENTRIES = int(os.environ.get('POLICE_CACHE_ENTRIES', 512))
+MAX_BYTES = int(os.environ.get('POLICE_CACHE_BYTES', 128 * 1024 * 1024))
+TTL_SECONDS = float(os.environ.get('POLICE_CACHE_TTL', 3600))
+
+
+def _size(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    return 1024
+
+
+class ResultCache:
+    """Thread-safe LRU cache with a TTL and hit/miss counters."""
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, ttl=TTL_SECONDS):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._drop(key)
+                self.expirations += 1
+            self.misses += 1
+        # Computed outside the lock; concurrent misses on one key may both
+        # compute, and the later result wins.
+        value = compute()
+        size = _size(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic(), value, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def _drop(self, key):
+        self._bytes -= self._entries.pop(key)[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the current footprint."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'expirations': self.expirations,
+                    'entries': len(self._entries), 'bytes': self._bytes}
+
+
+shared = ResultCache()
+
+
+def _key(page, widgets):
+    return (page, tuple(widgets), data_loader.dataset_version())
+
+
+def figure(page, widgets, build):
+    """Return a fresh Figure for this page and widget state.
+
+    build() returns a Plotly figure; its JSON spec is what gets cached.
+    """
+    def compute():
+        with instrument.stage('build:' + page):
+            fig = build()
+        with instrument.stage('to_json:' + page):
+            return fig.to_json()
+    spec = shared.get(_key(page, widgets), compute)
+    return pio.from_json(spec)
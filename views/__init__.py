@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Pages of the app, imported only when first selected.
+
+Each page module exposes render(). Heavy dependencies (pandas, plotly,
+pyarrow) and the dataset are only pulled in by the pages that use them, so a
+fresh process can paint the static pages without loading either. The import
+and render time of every page is recorded for startup_report(), which the
+sidebar timing panel shows, and each render runs as an instrument stage, with
+chart() timing figure construction and st.plotly_chart separately.
+
+Run "python -m views" to measure the cold import time of each page in fresh
+interpreters.
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+
+import instrument
+
+PAGES = {"Homepage": "views.home",
+         "Exploratory Analysis": "views.exploratory",
+         "Demographic Analysis": "views.demographic",
+         "Summary": "views.summary"}
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_report = {}
+
+
+def render(page):
+    """Import the module of page if needed and render it, recording timings."""
+    module_name = PAGES[page]
+    start = time.perf_counter()
+    cold = module_name not in sys.modules
+    module = importlib.import_module(module_name)
+    imported = time.perf_counter()
+    with instrument.stage('page:' + page):
+        module.render()
+    done = time.perf_counter()
+    with _lock:
+        entry = _report.get(page)
+        if entry is None:
+            entry = _report[page] = {'import_seconds': imported - start if cold else 0.0,
+                                     'first_render_seconds': done - imported,
+                                     'renders': 0,
+                                     'last_render_seconds': None}
+            logger.info("page %r: import %.3f s, first render %.3f s",
+                        page, entry['import_seconds'], entry['first_render_seconds'])
+        entry['renders'] += 1
+        entry['last_render_seconds'] = done - imported
+
+
+def chart(page, widgets, build):
+    """Draw the cached figure of page for these widget values, timing both steps."""
+    import streamlit as st
+    import result_cache
+    with instrument.stage('figure:' + page):
+        fig = result_cache.figure(page, widgets, build)
+    with instrument.stage('plotly_chart:' + page):
+        st.plotly_chart(fig)
+
+
+def startup_report():
+    """Return per-page import and render timings recorded in this process."""
+    with _lock:
+        return {page: dict(entry) for page, entry in _report.items()}
+
+
+def sidebar_status(st):
+    """Show dataset and chart cache figures, if a page has loaded them already."""
+    if 'data_loader' in sys.modules:
+        data_loader = sys.modules['data_loader']
+        stats = data_loader.load_stats(load=False)
+        if stats:
+            st.caption("Dataset: %d rows, %.1f MB in memory, loaded from %s in %.2f s"
+                       % (stats['rows'], stats['memory_bytes'] / 1e6, stats['source'],
+                          stats['load_seconds']))
+            # Only snapshots are memory-mapped; a store is read into private memory.
+            if stats['source'] != 'store':
+                st.caption("%.1f MB shared through the memory-mapped snapshot, %.1f MB private to this process"
+                           % (stats['shared_bytes'] / 1e6, stats['private_bytes'] / 1e6))
+            if stats['bytes_per_row_before']:
+                st.caption("%.0f bytes per row (%.0f before dtype narrowing)"
+                           % (stats['bytes_per_row'], stats['bytes_per_row_before']))
+    if 'result_cache' in sys.modules:
+        cache_stats = sys.modules['result_cache'].shared.stats()
+        st.caption("Chart cache: %d hits, %d misses, %d entries"
+                   % (cache_stats['hits'], cache_stats['misses'], cache_stats['entries']))
+
+
+def timing_panel(st):
+    """Show the stages of this rerun and the page timings of this process
+    (seconds) when the sidebar debug toggle is on.
+
+    The toggle is only offered with POLICE_DEBUG=1.
+    """
+    if not instrument.DEBUG_PANEL:
+        return
+    if st.checkbox("Show stage timings", key='timing_panel'):
+        st.code(instrument.format_stages(instrument.run_stages()), language=None)
+        lines = ['%-22s %9s %9s %9s %7s' % ('page', 'import', 'first', 'last', 'renders')]
+        for page, entry in sorted(startup_report().items()):
+            lines.append('%-22s %9.3f %9.3f %9.3f %7d' % (
+                page[:22], entry['import_seconds'], entry['first_render_seconds'],
+                entry['last_render_seconds'], entry['renders']))
+        st.code('\n'.join(lines), language=None)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Cold import time of each page, each measured in a fresh interpreter.
+
+    python -m views
+"""
+
+import json
+import subprocess
+import sys
+
+from views import PAGES
+
+PROBE = ("import time; start = time.perf_counter(); import streamlit, streamlit_option_menu; "
+         "base = time.perf_counter(); import %s; "
+         "print(base - start, time.perf_counter() - base)")
+
+
+def main():
+    report = {}
+    for page, module in PAGES.items():
+        out = subprocess.run([sys.executable, '-c', PROBE % module],
+                             capture_output=True, text=True, check=True).stdout
+        base, page_seconds = (float(v) for v in out.split())
+        report[page] = {'streamlit_import_seconds': round(base, 4),
+                        'page_import_seconds': round(page_seconds, 4)}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Demographic Analysis: search, arrest and stop duration rates per year and the
+speeding comparison between groups.
+"""
+
+import plotly.express as px
+import streamlit as st
+from streamlit_option_menu import option_menu
+
+import aggregates
+import data_loader
+import queries
+from views import chart
+
+
+def render():
+    selected_dem = option_menu(None, ["Searches vs Stops", "Stop Duration across years", "Arrests vs Stops", "Speeding trends"], 
+    default_index=0, orientation="horizontal")
+    
+    if selected_dem == "Searches vs Stops":
+        st.subheader("Percentage of searches per stops")
+        st.markdown('<div style="text-align: justify;"> Analyze the percentage of searches concerning the total number of stops. You have the flexibility to customize your analysis based on specific range of year and different demographic factors, such as age, gender, or race. </div>', unsafe_allow_html=True)
+        st.markdown("#####")
+        st.write("*Choose the range of years you are interested in analyzing. You can focus on a range of years to observe trends over time.*")
+        min_max_year = st.slider('Select the Year Range:', 2005, 2015, (2007, 2012))
+        st.markdown("####")
+        st.write("*Select whether you want to analyze the data based on age, gender, or race. This choice will determine how the data is categorized and visualized.*")
+        choose_hue = st.selectbox('Choose Demographic Factor:', ('driver_age_group', 'driver_race', 'driver_gender'))
+        
+        def search_rates():
+            rates = data_loader.cached(('rates', choose_hue, 'searches'),
+                                       lambda: aggregates.rate_table(queries.run('cube'), choose_hue, 'searches'))
+            temp = aggregates.year_slice(rates, min_max_year)
+            fig = px.line(temp,color=choose_hue)
+            fig.update_xaxes(showgrid=False, linecolor = "#BCCCDC")
+            fig.update_layout(plot_bgcolor='rgba(0, 0, 0, 0)')
+            fig.update_yaxes(showgrid=True,gridcolor='#BCCCDC',gridwidth=0.3, linecolor = "#BCCCDC")
+            if min_max_year[0]<2009:
+                fig.add_vline(x=2009, line_dash="dash")
+            fig.update_layout(yaxis_title='Search rates')
+            return fig
+        st.write("**You can notice that the trends shift in the year 2009**")
+        chart('search_rates', (choose_hue, min_max_year), search_rates)
+        st.write("**Note:** The figures depicted in this graph have been standardized according to the census data representing the different racial, age and gender groups in Rhode Island.")
+        
+        st.subheader("Let's uncover the story behind the graph!")
+        st.markdown("1. We observe a notable trend indicating that individuals within the age range of 65 to 100 years are consistently exempt from searches.")
+        st.markdown("2. Individuals between the ages of 19 and 64 are searched more frequently compared to those in the age brackets of 6 to 18 or 65 to 100.")
+        st.markdown("3. The graph reveals that black individuals are the most frequently searched, followed by Hispanics, and then Asians and whites.")
+        st.markdown("The observed trend where individuals in the age groups 65 to 100 are never searched can be influenced by several factors such as,")
+        st.markdown("- **Assumed Lower Risk:** Law enforcement officers might perceive elderly individuals as lower-risk in terms of criminal activity, leading to fewer searches in this age group.")
+        st.markdown("- **Respect for Elderly:** There might be a cultural or societal norm that emphasizes respect for the elderly, resulting in fewer searches out of courtesy and regard for their age.")
+        st.markdown("- **Health Considerations:** Older individuals may have health issues, and conducting searches could be physically challenging or potentially harmful, leading officers to avoid such procedures.")
+        
+        st.markdown('''<style>[data-testid="stMarkdownContainer"] ul{list-style-position: inside;}</style>''', unsafe_allow_html=True)
+        
+    elif selected_dem == "Arrests vs Stops":
+        st.subheader("Percentage of arrests per stops")
+        st.markdown('<div style="text-align: justify;"> Explore the percentage of arrests concerning the total number of police stops. </div>', unsafe_allow_html=True)
+        st.markdown("#####")
+        
+        st.write("*Choose the range of years you are interested in analyzing. You can focus on a range of years to observe trends over time.*")
+        min_max_year = st.slider('Select the Year Range:', 2005, 2015, (2005, 2008))
+        st.markdown("####")
+        st.write("*Select whether you want to analyze the data based on age, gender, or race. This choice will determine how the data is categorized and visualized.*")
+        choose_hue = st.selectbox('Choose the demographic factor:', ('driver_age_group', 'driver_race', 'driver_gender'))
+        
+        def arrest_rates():
+            rates = data_loader.cached(('rates', choose_hue, 'arrests'),
+                                       lambda: aggregates.rate_table(queries.run('cube'), choose_hue, 'arrests'))
+            temp = aggregates.year_slice(rates, min_max_year)
+            fig = px.line(temp,color=choose_hue)
+            fig.update_xaxes(showgrid=False, linecolor = "#BCCCDC")
+            fig.update_layout(plot_bgcolor='rgba(0, 0, 0, 0)')
+            fig.update_yaxes(showgrid=True,gridcolor='#BCCCDC',gridwidth=0.3, linecolor = "#BCCCDC")
+            fig.update_layout(yaxis_title='Arrest rate')
+            return fig
+        chart('arrest_rates', (choose_hue, min_max_year), arrest_rates)
+        st.write("**Note:** The figures depicted in this graph have been standardized according to the census data representing the different racial, age and gender groups in Rhode Island.")
+        
+        st.subheader("Let's uncover the story behind the graph!")
+        st.markdown("1. In 2006, the arrest rates for Black individuals notably decreased, although they continue to be higher than those for Hispanics, Whites, and Asians, with Hispanics having the second highest arrest rates among these groups.")
+        st.markdown("2. The arrest rates for men significantly exceed those for women, standing at nearly three to four times the rate at which women are arrested.")
+        st.markdown("3. Individuals between the ages of 19 and 64 exhibit higher arrest rates compared to any other age group, while those in the age group of 65 to 100 are rarely subject to arrest.")
+        
+        st.markdown("The reduction in arrest rates for Black individuals could be influenced by a range of factors like,")
+        st.markdown("- **Policy Reforms:** Law enforcement agencies might have implemented policy changes, emphasizing community engagement, diversion programs, or rehabilitation over strict enforcement, leading to reduced arrests.")
+        st.markdown("- **Community Outreach:** Increased efforts in community policing and engagement programs might have fostered trust and cooperation between law enforcement and minority communities, reducing confrontational interactions and subsequent arrests.")
+        st.markdown("- **Legal Reforms:** Changes in laws or reforms related to non-violent offenses, drug offenses, or sentencing guidelines might have reduced the number of arrests across all racial groups.")
+        
+        st.markdown('''<style>[data-testid="stMarkdownContainer"] ul{list-style-position: inside;}</style>''', unsafe_allow_html=True)
+        
+        
+    elif selected_dem == "Stop Duration across years":
+        st.subheader("Trends in average stop duration across years")
+        st.markdown('<div style="text-align: justify;"> Delve into the average stop duration concerning different periods. This interactive feature allows you to examine how the average duration of police stops has evolved over the chosen time frame. </div>', unsafe_allow_html=True)
+        st.markdown("#####")
+        
+        st.write("*Choose the range of years you are interested in analyzing. You can focus on a range of years to observe trends over time.*")
+        min_max_year = st.slider('Select the Year Range:', 2005, 2015, (2005, 2010))
+        st.markdown("####")
+        st.write("*Select whether you want to analyze the data based on age, gender, or race. This choice will determine how the data is categorized and visualized.*")
+        choose_hue = st.selectbox('Choose the demographic factor:', ('driver_age_group', 'driver_race', 'driver_gender'))
+        
+        def stop_durations():
+            rates = data_loader.cached(('rates', choose_hue, 'duration'),
+                                       lambda: aggregates.rate_table(queries.run('cube'), choose_hue, 'duration'))
+            temp = aggregates.year_slice(rates, min_max_year)
+            fig = px.line(temp,color=choose_hue)
+            fig.update_xaxes(showgrid=False, linecolor = "#BCCCDC")
+            fig.update_layout(plot_bgcolor='rgba(0, 0, 0, 0)')
+            fig.update_yaxes(showgrid=True,gridcolor='#BCCCDC',gridwidth=0.3, linecolor = "#BCCCDC")
+            fig.update_layout(yaxis_title='Stop duration')
+            return fig
+        chart('stop_durations', (choose_hue, min_max_year), stop_durations)
+        
+        st.subheader("Let's uncover the story behind the graph!")
+        st.markdown("1. For individuals within the age group of 6 to 18, the duration of police stops is higher in comparison to other age groups.")
+        st.markdown("2. For elderly individuals, specifically those aged between 65 and 100, the duration of police stops is higher than people belonging to the age groups 19 to 64.")
+        st.markdown("3. The duration of police stops is longer for women in comparison to men.")
+        
+        st.markdown("The longer stop durations for individuals aged 6 to 18 could be influenced by several factors:")
+        st.markdown("- **Parental Involvement:** Police officers might spend more time ensuring the safety and well-being of minors, which often involves interacting with parents or guardians, checking their identities, and confirming the child's relationship with them.")
+        st.markdown("- **Document Verification:** Officers may need to verify identification documents and contact parents or legal guardians to confirm the minor's identity, which can prolong the stop duration.")
+        st.markdown("- **Child Safety Protocols:** Law enforcement officers could be following specific protocols and procedures when dealing with minors, requiring additional time to confirm the child's safety, identity, and accompanying adult's authorization.")
+        
+        st.markdown("The fluctuations in stop duration for individuals aged 65 to 100 could be influenced by various factors such as,")
+        st.markdown("- **Health Conditions:** Older individuals may have health issues or mobility challenges, leading to longer stop durations as they might need more time to provide information or exit the vehicle.")
+        st.markdown("- **Communication Difficulties:** Seniors might experience hearing or communication difficulties, requiring officers to spend more time ensuring clear understanding, thereby increasing the stop duration.")
+        st.markdown("- **Assistance Requirements:** Older individuals might need assistance in retrieving documents or complying with requests, contributing to extended stop durations.")
+        
+        st.markdown("The longer stop durations for women compared to men could be influenced by a variety of factors like,")
+        st.markdown("- **Documentation Verification:** Officers might spend more time verifying identification documents or licenses for women, especially if there are name changes due to marriage or other reasons.")
+        st.markdown("- **Safety Concerns:** Law enforcement officers could exercise extra precautions with women, particularly during late hours, to ensure their safety, which might involve more thorough checks and inquiries.")
+        st.markdown("- **Search Procedures:** If a search is required, female officers might be called to conduct the search on women, which could take additional time.")
+        
+        st.markdown('''<style>[data-testid="stMarkdownContainer"] ul{list-style-position: inside;}</style>''', unsafe_allow_html=True)
+        
+    elif selected_dem == "Speeding trends":
+        st.subheader("Understanding Speeding Patterns Across Demographics!")
+        st.markdown('<div style="text-align: justify;"> Compare speeding incidents between different races or genders that you select. Explore the disparities in speeding patterns by comparing one race to another or analyzing gender categories comprehensively. </div>', unsafe_allow_html=True)
+        st.markdown("#####")
+        
+        st.write("*Choose whether you want to analyze speeding patterns based on races or genders. This selection will determine the demographic factor that forms the basis of your analysis.*")
+        choose_column = st.selectbox('Select Speeding Analysis Type', ('driver_race', 'driver_gender'))
+        
+        speeding = data_loader.cached(('speeding_by_age', choose_column),
+                                      lambda: aggregates.speeding_by_age(queries.run('speeding_' + choose_column), choose_column))
+        column1 = st.selectbox('Pick a parameter to define the x-axis variable for your analysis', speeding.columns)
+        column2 = st.selectbox('Pick a parameter to define the y-axis variable for your analysis', speeding.columns)
+        
+        def speeding_scatter():
+            temp = aggregates.speeding_pair(speeding, column1, column2)
+            fig=px.scatter(temp,x='0_x',y='0_y',size='age',width=400,height=400, 
+                       labels={'0_x':column1, '0_y':column2})
+        
+            if temp['0_x'].max()>temp['0_y'].max():
+                val=temp['0_x'].max()
+            else:
+                val=temp['0_y'].max()
+            
+            if temp['0_x'].min()<temp['0_y'].min():
+                val2=temp['0_x'].min()
+            else:
+                val2=temp['0_y'].min()
+            
+            if temp['0_x'].std()>temp['0_y'].std():
+                sd=temp['0_x'].std()
+            else:
+                sd=temp['0_y'].std()
+        
+            fig.update_yaxes(range=[val2-sd, val+sd])
+            fig.update_xaxes(range=[val2-sd, val+sd])
+            fig.update_layout(shapes = [{'type': 'line', 'yref': 'paper', 'xref': 'paper', 'y0': 0, 'y1': 1, 'x0': 0, 'x1': 1}])
+            return fig
+        chart('speeding', (choose_column, column1, column2), speeding_scatter)
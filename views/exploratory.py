@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Exploratory Analysis: violation breakdowns, drug usage trends and time series.
+"""
+
+import datetime
+
+import plotly.express as px
+import streamlit as st
+from streamlit_option_menu import option_menu
+
+import aggregates
+import data_loader
+import queries
+from views import chart
+
+
+def render():
+    selected_exp = option_menu(None, ["Violation vs Other Attributes", "Drug Usage Trends", "Time Series Trends"], 
+    default_index=0, orientation="horizontal")
+    
+    if selected_exp == "Violation vs Other Attributes":
+        def stop_outcomes():
+            viol_so = data_loader.as_labels(queries.run('violation_outcome'))
+            fig = px.histogram(viol_so, x="violation", y="stops", color="stop_outcome", barnorm='percent')
+            fig.update_layout(yaxis_title='Stop outcome percentage')
+            return fig
+        st.subheader("Stop outcomes for each violation")
+        chart('violation_outcome', (), stop_outcomes)
+        
+        def search_types():
+            viol_st = data_loader.as_labels(queries.run('violation_search_type'))
+            fig2 = px.histogram(viol_st, x="violation", y="stops", color="search_type_agg", barnorm='percent')
+            fig2.update_layout(yaxis_title='Search type percentage')
+            return fig2
+        st.subheader("Search Type for each violation")
+        chart('violation_search_type', (), search_types)
+        
+        st.subheader("Violation vs Search Conducted")
+        chart('searches_by_violation', (), lambda: px.pie(
+            data_loader.as_labels(queries.run('searches_by_violation')), values='search_conducted', names='violation'))
+        
+        st.subheader("Violation vs Arrests")
+        chart('arrests_by_violation', (), lambda: px.pie(
+            data_loader.as_labels(queries.run('arrests_by_violation')), values='is_arrested', names='violation'))
+        
+    elif selected_exp == "Drug Usage Trends":
+        st.subheader("Explore Daily Trends in Drug-Related Stops")
+        st.write("Comprehensive view of how these stops vary over different hours. Dive into the data to gain a nuanced understanding of how the number of drug-related stops vary during various times of the day.")
+        drugs = data_loader.cached('drug_counts', lambda: aggregates.drug_counts(queries.run('drug_stops')))
+        def drugs_by_hour(ylabel):
+            fig = px.line(drugs['stop_time'], x='stop_time', y='count')
+            fig.update_layout(xaxis_title="Hour of the Day", yaxis_title=ylabel)
+            return fig
+        chart('drugs_by_hour', (), lambda: drugs_by_hour("Number of Drug Related Stops"))
+        
+        st.subheader("Examine Age-specific Trends in Drug-Related Stops")
+        st.write("Below is the graph to understand the trends in drug-related stops categorized by age groups. Delve into the specifics to gain insights into how these stops differ among various age groups, providing valuable context for understanding law enforcement practices concerning drug-related incidents.")
+        chart('drugs_by_age_group', (), lambda: px.pie(
+            drugs['driver_age_group'], values='normalized_count', names='driver_age_group'))
+        st.write("**Note:** The figures depicted in this graph have been standardized according to the census data representing the different age groups in Rhode Island.")
+        
+        st.subheader("Duration of Stops in Drug-Related Incidents")
+        st.write("Explore the stop duration patterns in incidents related to drugs. Investigate the duration disparities to gain a comprehensive understanding of the time spent during these specific interactions between law enforcement and individuals involved in drug-related incidents.")
+        chart('drugs_duration_by_hour', (), lambda: drugs_by_hour("Stop duration"))
+        
+        st.subheader("Analyze Drug-Related Stops Across Racial Groups")
+        st.write("Dive into the visualization to understand how these stops vary between different races, offering valuable perspectives on the intersection of law enforcement practices and racial backgrounds in drug-related incidents.")
+        def drugs_by_race():
+            fig = px.bar(drugs['driver_race'], x='driver_race', y='normalized_count')
+            fig.update_layout(yaxis_title='Stop rates')
+            return fig
+        chart('drugs_by_race', (), drugs_by_race)
+        st.write("**Note:** The figures depicted in this graph have been standardized according to the census data representing the different racial groups in Rhode Island.")
+        
+    elif selected_exp=='Time Series Trends':
+        st.markdown('<div style="text-align: justify;"> Delve into time series trends related to the selected violation type, stop outcome, and search category within your specified start and end dates. Gain valuable insights into how these factors have evolved over time, helping you understand the dynamic patterns for each selection.  </div>', unsafe_allow_html=True)
+        st.markdown("#####")
+        
+        d1 = st.date_input("Specify your chosen start date:", datetime.date(2006, 7, 6))
+        d2 = st.date_input("Specify your chosen end date:", datetime.date(2009, 7, 6))
+        # Long ranges are binned by week or month, and any series still over
+        # the point budget is downsampled, so chart payloads stay bounded.
+        resolution = st.selectbox('Choose the time resolution:', ('Auto', 'Day', 'Week', 'Month'))
+        grain = aggregates.resolution(d1, d2) if resolution == 'Auto' else resolution.lower()
+        st.caption("Showing stops per %s" % grain)
+        daily = data_loader.cached(('daily', 'violation'), lambda: aggregates.daily_counts(queries.run('daily_violation'), 'violation'))
+        violation=st.selectbox('Select a type of violation:',list(daily))
+        def violation_series():
+            fig4=px.line(aggregates.downsample(aggregates.bin_series(
+                aggregates.date_range(daily, violation, d1, d2, name='violation'), grain)))
+            fig4.update_layout(yaxis_title='Frequency')
+            return fig4
+        chart('daily_violation', (violation, d1, d2, grain), violation_series)
+        
+        daily = data_loader.cached(('daily', 'stop_outcome'), lambda: aggregates.daily_counts(queries.run('daily_stop_outcome'), 'stop_outcome'))
+        stop_out=st.selectbox('Select a type of Stop Outcome:',list(daily))
+        def stop_outcome_series():
+            fig5=px.line(aggregates.downsample(aggregates.bin_series(
+                aggregates.date_range(daily, stop_out, d1, d2, name='stop_outcome'), grain)))
+            fig5.update_layout(yaxis_title='Frequency')
+            return fig5
+        chart('daily_stop_outcome', (stop_out, d1, d2, grain), stop_outcome_series)
+        
+        daily = data_loader.cached(('daily', 'search_type_agg'), lambda: aggregates.daily_counts(queries.run('daily_search_type_agg'), 'search_type_agg'))
+        search_out=st.selectbox('Select Search type:',list(daily))
+        def search_type_agg_series():
+            fig6=px.line(aggregates.downsample(aggregates.bin_series(
+                aggregates.date_range(daily, search_out, d1, d2, name='search_type_agg'), grain)))
+            fig6.update_layout(yaxis_title='Frequency')
+            return fig6
+        chart('daily_search_type_agg', (search_out, d1, d2, grain), search_type_agg_series)
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Homepage: dataset description, summary statistics, the sample data explorer
+and educational resources. Only the explorer tab touches the dataset.
+"""
+
+import streamlit as st
+from streamlit_option_menu import option_menu
+
+import instrument
+
+
+def render():
+    # App Description
+    selected_home = option_menu(None, ["About the dataset",
+    "Summary Statistics", "Sample Data Explorer", "Educational Resources"],
+    icons=['house', 'gear', 'globe', 'book'], menu_icon="cast", 
+    default_index=0, orientation="horizontal")
+    
+    if selected_home == "About the dataset":
+        st.subheader("Motivation behind the web app")
+        st.markdown('<div style="text-align: justify;"> Every day, law enforcement in the U.S. conducts over 50,000 traffic stops. According to the Time Magazine, while many of these stops are conducted to ensure road safety, a significant portion is initiated for reasons unrelated to drivers behavior on the road. </div>', unsafe_allow_html=True)
+        st.markdown('#####')
+        st.subheader("Significance of the web app")
+        st.markdown('<div style="text-align: justify;"> By visualizing and summarizing policing data, the app raises awareness about law enforcement activities, including patterns in stops, demographics, and potential biases. This awareness can lead to informed discussions and actions for positive change. </div>', unsafe_allow_html=True)
+        st.markdown('#####')
+        st.markdown('<div style="text-align: justify;"> Utilizing data-driven insights, the web app can aid in identifying potential patterns and trends related to criminal activities. By understanding these patterns, law enforcement agencies and communities can work together to implement proactive strategies and interventions aimed at preventing crimes. This approach focuses on community-wide safety initiatives promoting a safer environment for everyone </div>', unsafe_allow_html=True)
+        st.markdown('######')
+        st.subheader("Brief description of the dataset")
+        st.markdown('<div style="text-align: justify;"> This web app displays information and insights about the traffic stops in the state of Rhode Island. The dataset encapsulates a decade worth of information, covering the period from January 2005 to December 2015. The data recorded in this project includes, </div>', unsafe_allow_html=True)
+        st.markdown("- Date and Time: Information about the date and time when the police stop occurred.")
+        st.markdown("- Driver Demographics: Information about the driver, such as race, gender, age, and ethnicity.")
+        st.markdown("- Reason for Stop: The primary reason for the police stop, such as speeding, traffic violation, suspicious behavior, etc.")
+        st.markdown("- Stop Outcome: The outcome of the stop, including whether a citation was issued, a warning given, or an arrest made.")
+        st.markdown("- Search Details: If a vehicle or individual was searched, the reasons for the search and whether any contraband or illegal items were found.")
+        
+        st.markdown('''<style>[data-testid="stMarkdownContainer"] ul{list-style-position: inside;}</style>''', unsafe_allow_html=True)
+    
+    elif selected_home == "Summary Statistics":
+        st.write("**Explore the Summary Statistics page, your gateway to key insights about the dataset. Here, you'll find a concise overview that provides some context about the data at your fingertips.**")
+        
+        st.subheader("What You'll Discover:")
+        
+        st.markdown("1. **Total Number of Records:** Get an understanding of the dataset's scale. Learn how many records are available, giving you an idea of the dataset's scope and depth.")
+        st.markdown("- The dataset comprises 91,741 recorded stops. However, this analysis is based on 86,113 usable rows due to the presence of missing values in certain fields.")
+        st.markdown("2. **Common Values for some columns like:**")
+        st.markdown("- **Unique Categories of Stops:** The reason behind the stops include *Speeding*, *Moving Violation*, *Equipment*, *Registration*, and *Seat Belt*")
+        st.markdown("- **Demographic Information:** *Race* includes values such as White, Black, Hispanic, Asian, and other. While, *gender* which includes values such as Male and Female. Also, *age* ranging from 15 to 99.")
+        st.markdown("3. **Column Overview:** **Reason for Stops:**")
+        st.markdown("- *Speeding - 56%*")
+        st.markdown("- *Moving Violation - 18.7%*")
+        st.markdown("- *Equipment - 12.7%*")
+        st.markdown("- *Registration/Plates - 3.9%*")
+        st.markdown("- *Seat belt - 3.4%*")
+        st.markdown("- *Other - 4.9%*")
+        st.markdown('''<style>[data-testid="stMarkdownContainer"] ul{list-style-position: inside;}</style>''', unsafe_allow_html=True)
+        st.markdown("4. **Column Overview:** **Outcome of Stops:**")
+        st.markdown("- *Citation - 89%*")
+        st.markdown("- *Warning - 6%*")
+        st.markdown("- *Arrest Driver - 2.9%*")
+        st.markdown("- *Other - 3%*")
+        st.markdown('''<style>[data-testid="stMarkdownContainer"] ul{list-style-position: inside;}</style>''', unsafe_allow_html=True)
+        
+    elif selected_home == "Sample Data Explorer":
+        # Imported here so the static tabs never load pandas or the dataset.
+        import data_loader
+        import export
+        import filters
+        
+        st.write("**Welcome to the Data Explorer section, where you have the power to navigate the dataset according to your preferences.**")
+        st.write("**Export the selected data:** Need to analyze the data offline or share your findings? Export your customized results in CSV, gzipped CSV or Parquet format, for further analysis or presentation!")
+        selected_de = st.multiselect('Select columns to see the data present in it', data_loader.column_names(),
+                                     ['stop_date', 'driver_gender', 'driver_age', 'driver_race', 'violation'])
+
+        choose_year = st.slider('Choose a year to see the data', min_value=2005, max_value=2015, value=2010)
+        choose_hours = st.slider('Choose the hours of the day', min_value=0, max_value=23, value=(0, 23))
+
+        # The chosen year is indexed within the shared frame (or read alone
+        # from a store) and filters are resolved on its per-value row indexes,
+        # so only the matching rows of the selected columns are ever copied.
+        df, rows, index = filters.year_index(choose_year)
+        spec = {'stop_time': [] if choose_hours == (0, 23) else list(range(choose_hours[0], choose_hours[1] + 1))}
+        for column, label in (('driver_race', 'race'), ('driver_gender', 'gender'),
+                              ('violation', 'violation'), ('stop_outcome', 'stop outcome')):
+            spec[column] = st.multiselect('Filter by %s (all if empty)' % label, list(index[column]))
+
+        with instrument.stage('sample_rows') as stage:
+            positions = filters.select(index, spec, rows)
+            stage['rows'] = len(positions)
+            st.caption("%d matching stops" % len(positions))
+            st.dataframe(filters.take(df, positions[:10], selected_de))
+        
+        export_format = st.selectbox('Choose an export format', list(export.FORMATS))
+        extension, mime = export.FORMATS[export_format]
+        export_key = (data_loader.dataset_version(), tuple(selected_de), choose_year,
+                      tuple((column, tuple(values)) for column, values in spec.items()))
+        customized_button = st.markdown("""
+                                <style>
+                                .stDownloadButton, div.stButton {text-align:right}
+                                .stDownloadButton button, div.stButton > button:first-child {
+                                background-color: #000000;
+                                color:#FFFFFF;
+                                padding-left: 20px;
+                                padding-right: 20px;
+                                }
+    
+                            .stDownloadButton button:hover, div.stButton > button:hover {
+                            background-color: #ADD8E6;
+                            color:#000000;
+                            }
+                        </style>""", unsafe_allow_html=True)
+        
+        # The file is only built once the user asks for it, then kept in the
+        # export cache for everyone requesting the same selection.
+        if st.button("Prepare download"):
+            st.session_state['export_request'] = (export_key, export_format)
+        if st.session_state.get('export_request') == (export_key, export_format):
+            with instrument.stage('export:' + export_format):
+                data = export.export(export_key, lambda: filters.take(df, positions, selected_de), export_format)
+            st.download_button(
+                label="Download data as %s" % export_format,
+                data=data,
+                file_name='open_policing_dataset_rhode_island.%s' % extension,
+                mime=mime,
+                )
+    
+    elif selected_home == "Educational Resources":
+        st.write("For additional insights into this dataset, click the link below,")
+        url1 = "https://openpolicing.stanford.edu/data/"
+        st.write("[Stanford Open Policing Project](%s)" % url1)
+        
+        st.subheader("Articles and Research Papers")
+        st.write("Comprehensive research papers discussing racial disparities in policing practices.")
+        url2 = "https://5harad.com/papers/policing-the-police.pdf"
+        st.write("[Combatting Police Discrimination in the age of Big Data](%s)" % url2)
+        url3 = "https://5harad.com/papers/simple-rules.pdf"
+        st.write("[Simple Rules to guide expert classifications](%s)" % url3)
+        
+        st.subheader("Community Safety Programs")
+        st.write("Information about neighborhood watch programs and how communities can work together for safety.")
+        url4 = "https://bja.ojp.gov/sites/g/files/xyckuh186/files/Publications/NSA_NW_Manual.pdf"
+        st.write("[Neighborhood Watch Program](%s)" % url4)
+        
+        st.subheader("Educational Videos")
+        st.write("An educational video explaining legal rights during police stops and interactions.")
+        url5 = "https://www.youtube.com/watch?v=f26QJKREYB8&t=8s"
+        st.write("[Know your rights!](%s)" % url5)
+        
+        st.subheader("References")
+        st.write("Data used for this analysis is obtained from the below references:")
+        st.write("https://openpolicing.stanford.edu/publications/")
+        st.write("https://github.com/stanford-policylab/opp")
+        st.write("https://www.kaggle.com/datasets/yassershrief/dataset-of-traffic-stops-in-rhode-island")
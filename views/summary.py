@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""
+Summary page: static text only.
+"""
+
+import streamlit as st
+
+
+def render():
+    st.subheader("Significance:")
+    st.markdown('<div style="text-align: justify;"> Exploring Stanford Open Policing Dataset to understand law enforcement practices can be helpful to not only enhance interaction between the police and the public but can also potentially contribute to the safety and well-being of communities. This initiative aligns with the broader goal of creating proactive, data-driven solutions for crime prevention, making it a project of immense value and impact. </div>', unsafe_allow_html=True)
+    st.markdown('#####')
+    st.subheader("Focus Dataset:")
+    st.markdown('<div style="text-align: justify;"> Stanford Open Policing Dataset (Rhode Island): Contains crucial data on stop time, violation, and outcomes. </div>', unsafe_allow_html=True)
+    st.markdown('#####')
+    st.subheader("Potential Impact:")
+    st.markdown('<div style="text-align: justify;">  Improved Police-Community Relations and community well-being </div>', unsafe_allow_html=True)
+    st.markdown('#####')
+    st.subheader("Next Steps:")
+    st.markdown('<div style="text-align: justify;">  Predict crime patterns based on the patterns observed in this historical data which will aid crime prevention. </div>', unsafe_allow_html=True)
\ No newline at end of file